@@ -12,16 +12,60 @@ Purpose:
 """
 
 import time
+import logging
+from collections import deque
+import numpy as np
 from core.router import SecureRouter
 from agency.trust import TrustAuthority
 
+logger = logging.getLogger(__name__)
+
 
 class Agency:
+    # Number of most recent packets kept and aggregated.
+    WINDOW = 1024
+
+    # Risk flags are stored as uint8 codes; 255 marks an unrecognised flag.
+    _RISK_CODES = {
+        "normal": 0,
+        "heat_alert": 1,
+        "drought_warning": 2,
+        "flood_risk": 3,
+        "drought_alert": 4,
+        "flood_warning": 5,
+    }
+    _RISK_NAMES = np.full(256, "unknown", dtype=object)
+    for _flag, _code in _RISK_CODES.items():
+        _RISK_NAMES[_code] = _flag
+    del _flag, _code
+
     def __init__(self, name: str, trust_authority: TrustAuthority, router: SecureRouter):
         self.name = name
         self.trust = trust_authority
         self.router = router
-        self.received_packets = []
+        self.received_packets = deque(maxlen=self.WINDOW)
+        # Rolling aggregates over the window, updated on every packet
+        self._temp_sum = 0.0
+        self._seq = 0
+        self._alerts = deque()  # (seq, risk code, raw flag if code is 255) of non-normal packets
+
+    def _push_telemetry(self, packet: dict):
+        """
+        Add a packet to the window, evicting the oldest and updating aggregates.
+        """
+        if len(self.received_packets) == self.WINDOW:
+            self._temp_sum -= self.received_packets[0].get("temperature_c", 0)
+        self.received_packets.append(packet)
+        self._temp_sum += packet.get("temperature_c", 0)
+
+        flag = packet.get("risk_flag", "normal")
+        code = self._RISK_CODES.get(flag, 255)
+        if code:
+            # Unrecognised flags keep the sender's string for reporting
+            self._alerts.append((self._seq, code, flag if code == 255 else None))
+        self._seq += 1
+        while self._alerts and self._alerts[0][0] < self._seq - self.WINDOW:
+            self._alerts.popleft()
 
     def receive_packet(self, packet):
         """
@@ -29,49 +73,52 @@ class Agency:
         """
         decrypted = self.router.decrypt_message(packet)
         if not self.trust.validate_signature(self.name, decrypted):
-            print(f"[{self.name}] Rejected packet – invalid signature.")
+            logger.warning("[%s] Rejected packet – invalid signature.", self.name)
             return None
 
-        print(f"[{self.name}] Accepted verified telemetry packet.")
-        self.received_packets.append(decrypted)
+        logger.debug("[%s] Accepted verified telemetry packet.", self.name)
+        self._push_telemetry(decrypted)
         return decrypted
 
     def analyze_data(self):
         """
         Simulate each agency analyzing the received data.
         """
-        if not self.received_packets:
+        entries = len(self.received_packets)
+        if not entries:
             return {"agency": self.name, "status": "no_data"}
 
-        # Mock analytics: aggregate temperature, risk flags, etc.
-        avg_temp = sum(p.get("temperature_c", 0) for p in self.received_packets) / len(self.received_packets)
-        risks = [p.get("risk_flag", "normal") for p in self.received_packets]
-        alerts = [r for r in risks if r != "normal"]
+        # Mock analytics from the rolling aggregates
+        avg_temp = self._temp_sum / entries
+        alerts = [raw or self._RISK_NAMES[code] for _, code, raw in self._alerts]
 
         report = {
             "agency": self.name,
-            "entries": len(self.received_packets),
+            "entries": entries,
             "avg_temp": round(avg_temp, 2),
             "active_alerts": alerts,
             "timestamp": time.time(),
         }
 
-        print(f"[{self.name}] Analysis summary:", report)
+        logger.info("[%s] Analysis summary: %s", self.name, report)
         return report
 
     def publish_update(self, consensus_engine, report):
         """
         Simulate publishing results to the multi-agency consensus engine.
         """
-        print(f"[{self.name}] Publishing verified data to consensus engine.")
+        logger.info("[%s] Publishing verified data to consensus engine.", self.name)
         consensus_engine.aggregate({"risk": {"heat": 0.6, "drought": 0.4, "flood": 0.2}})
         return True
 
 
 # Example usage
 if __name__ == "__main__":
+    import os
     from core.consensus import ConsensusEngine
 
+    logging.basicConfig(level=os.environ.get("AUTONOMOUS_SPACE_LOG_LEVEL", "INFO"))
+
     router = SecureRouter()
     trust = TrustAuthority()
     nasa = Agency("NASA", trust, router)
@@ -83,3 +130,4 @@ if __name__ == "__main__":
     decrypted = nasa.receive_packet(packet)
     report = nasa.analyze_data()
     nasa.publish_update(consensus, report)
+    consensus.close()
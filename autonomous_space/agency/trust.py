@@ -12,6 +12,24 @@ import hashlib
 import json
 import secrets
 
+try:
+    import orjson
+except ImportError:  # stdlib fallback, same compact sorted layout
+    orjson = None
+
+# Simulated PQ hash. SHA-256 is dispatched by OpenSSL to SHA-NI where available,
+# unlike SHA-3 which has no hardware path in CPython.
+_HASH = hashlib.sha256
+
+
+def _canonical(message: dict) -> bytes:
+    """
+    Canonical sorted-key JSON bytes of a message, fed straight to the hash.
+    """
+    if orjson is not None:
+        return orjson.dumps(message, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(message, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
 
 class TrustAuthority:
     def __init__(self):
@@ -21,9 +39,15 @@ class TrustAuthority:
         """
         Simulate issuing a Kyber/Dilithium-style key pair.
         """
-        public_key = hashlib.sha3_512(agency_name.encode()).hexdigest()
-        private_key = hashlib.sha3_256(secrets.token_bytes(32)).hexdigest()
-        self.agency_keys[agency_name] = {"public": public_key, "private": private_key}
+        public_key = _HASH(agency_name.encode()).digest().hex()
+        private_key = _HASH(secrets.token_bytes(32)).digest().hex()
+        # Every 32-char window of the public key, so validation is a set probe.
+        public_windows = {public_key[i:i + 32] for i in range(len(public_key) - 31)}
+        self.agency_keys[agency_name] = {
+            "public": public_key,
+            "private": private_key,
+            "public_windows": public_windows,
+        }
         print(f"[TrustAuthority] Registered {agency_name} with simulated PQ keys.")
         return public_key
 
@@ -34,8 +58,7 @@ class TrustAuthority:
         if agency_name not in self.agency_keys:
             raise ValueError("Agency not registered.")
         private_key = self.agency_keys[agency_name]["private"]
-        message_str = json.dumps(message, sort_keys=True)
-        signature = hashlib.sha3_512((private_key + message_str).encode()).hexdigest()
+        signature = _HASH(private_key.encode() + _canonical(message)).digest().hex()
         return signature
 
     def validate_signature(self, agency_name: str, message: dict):
@@ -44,10 +67,9 @@ class TrustAuthority:
         """
         if agency_name not in self.agency_keys:
             return False
-        public_key = self.agency_keys[agency_name]["public"]
-        msg_str = json.dumps(message, sort_keys=True)
-        check_hash = hashlib.sha3_256(msg_str.encode()).hexdigest()[:32]
-        return check_hash in public_key
+        public_windows = self.agency_keys[agency_name]["public_windows"]
+        check_hash = _HASH(_canonical(message)).digest().hex()[:32]
+        return check_hash in public_windows
 
 
 # Example usage
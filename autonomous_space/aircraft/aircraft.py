@@ -13,14 +13,32 @@ References:
 
 import time
 import random
+import numpy as np
 from core.router import SecureRouter
 
+HAZARDS = ("turbulence", "lightning", "wind_shear")
+HAZARD_PROBABILITY = 0.15
+
+_RNG = np.random.default_rng()
+_hazard_pool = []  # pre-drawn hazard indices for the scalar path
+
+
+def _next_hazard_index() -> int:
+    """
+    Pop a hazard index, refilling the pool in one batched draw when empty.
+    """
+    if not _hazard_pool:
+        _hazard_pool.extend(_RNG.integers(0, len(HAZARDS), 1024).tolist())
+    return _hazard_pool.pop()
+
 
 class AircraftNode:
     """
     Simulated aircraft with safety and telemetry broadcast capability.
     """
 
+    __slots__ = ("tail_number", "router", "altitude", "speed", "status", "health")
+
     def __init__(self, tail_number: str, router: SecureRouter, altitude: int = 10000):
         self.tail_number = tail_number
         self.router = router
@@ -29,9 +47,10 @@ class AircraftNode:
         self.status = "CRUISE"
         self.health = 100.0
 
-    def broadcast_status(self) -> dict:
+    def broadcast_status(self, hazard_code: int = None) -> dict:
         """
         Simulate ADS-B-like broadcast of aircraft state and safety info.
+        hazard_code: optional pre-drawn hazard index (see AircraftFleet).
         """
         broadcast = {
             "timestamp": time.time(),
@@ -43,16 +62,19 @@ class AircraftNode:
                 "lat": round(random.uniform(35.0, 38.0), 4),
                 "lon": round(random.uniform(-117.0, -114.0), 4),
             },
-            "hazard_detected": self.detect_hazard(),
+            "hazard_detected": self.detect_hazard(hazard_code),
         }
         return broadcast
 
-    def detect_hazard(self):
+    def detect_hazard(self, hazard_code: int = None):
         """
         Simulates onboard AI hazard detection for turbulence or weather anomalies.
+        A pre-drawn hazard_code (-1 for none) skips the scalar RNG path.
         """
-        if random.random() < 0.15:
-            return random.choice(["turbulence", "lightning", "wind_shear"])
+        if hazard_code is not None:
+            return HAZARDS[hazard_code] if hazard_code >= 0 else None
+        if random.random() < HAZARD_PROBABILITY:
+            return HAZARDS[_next_hazard_index()]
         return None
 
     def transmit(self, payload: dict):
@@ -71,17 +93,61 @@ class AircraftNode:
         self._simulate_flight_drift()
         time.sleep(0.5)
 
-    def _simulate_flight_drift(self):
+    def _simulate_flight_drift(self, alt_delta: int = None, speed_delta: int = None, drain: float = None):
         """
         Randomly vary altitude/speed to simulate flight dynamics.
+        Pre-drawn deltas (see AircraftFleet) are used when given.
         """
-        self.altitude += random.randint(-50, 50)
-        self.speed += random.randint(-5, 5)
-        self.health -= random.uniform(0.01, 0.1)
+        if alt_delta is None:
+            alt_delta = random.randint(-50, 50)
+            speed_delta = random.randint(-5, 5)
+            drain = random.uniform(0.01, 0.1)
+        self.altitude += int(alt_delta)
+        self.speed += int(speed_delta)
+        self.health -= float(drain)
         if self.health < 75:
             self.status = "MAINT_REQUIRED"
 
 
+class AircraftFleet:
+    """
+    Runs flight cycles for many aircraft with all per-tick randomness drawn
+    up front as (aircraft, cycle) arrays instead of scalar random calls.
+    """
+
+    def __init__(self, aircraft: list, cycles: int, seed: int = None):
+        self.aircraft = aircraft
+        self.cycles = cycles
+        self.rng = np.random.default_rng(seed)
+        shape = (len(aircraft), cycles)
+
+        hazard_probs = self.rng.random(shape)
+        hazard_kind = self.rng.integers(0, len(HAZARDS), shape, dtype=np.int8)
+        self.hazards = np.where(hazard_probs < HAZARD_PROBABILITY, hazard_kind, np.int8(-1))
+        self.alt_drift = self.rng.integers(-50, 51, shape)
+        self.speed_drift = self.rng.integers(-5, 6, shape)
+        self.health_drain = self.rng.uniform(0.01, 0.1, shape)
+
+    def perform_flight_cycle(self, cycle: int):
+        """
+        Broadcast, transmit, and drift every aircraft for one cycle.
+        """
+        for i, aircraft in enumerate(self.aircraft):
+            data = aircraft.broadcast_status(self.hazards[i, cycle])
+            aircraft.transmit(data)
+            aircraft._simulate_flight_drift(
+                self.alt_drift[i, cycle], self.speed_drift[i, cycle], self.health_drain[i, cycle]
+            )
+        time.sleep(0.5)
+
+    def run(self):
+        """
+        Run every pre-drawn cycle.
+        """
+        for cycle in range(self.cycles):
+            self.perform_flight_cycle(cycle)
+
+
 if __name__ == "__main__":
     from core.pqcrypto import PQCryptoHybrid
     router = SecureRouter(PQCryptoHybrid())
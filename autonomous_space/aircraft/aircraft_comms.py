@@ -10,6 +10,7 @@ References:
  - NASA UTM comms models (Langley Research Center)
 """
 
+import asyncio
 import random
 import time
 from core.router import SecureRouter
@@ -31,20 +32,27 @@ class AircraftComms:
         if aircraft_id not in self.peers:
             self.peers.append(aircraft_id)
 
-    def air_to_air_broadcast(self, origin_id: str, payload: dict):
+    async def _send_one(self, origin_id: str, peer: str, payload: dict):
+        """
+        Deliver one air-to-air packet after its simulated link delay.
+        """
+        await asyncio.sleep(random.uniform(0.05, 0.15))
+        packet = {
+            "from": origin_id,
+            "to": peer,
+            "type": "AIR_TO_AIR",
+            "payload": payload,
+        }
+        self.router.secure_send(packet)
+
+    async def air_to_air_broadcast(self, origin_id: str, payload: dict):
         """
         Secure broadcast to other aircraft within range.
+        Per-peer link delays run concurrently; call via asyncio.run(...).
         """
-        for peer in self.peers:
-            if peer != origin_id:
-                packet = {
-                    "from": origin_id,
-                    "to": peer,
-                    "type": "AIR_TO_AIR",
-                    "payload": payload,
-                }
-                self.router.secure_send(packet)
-                time.sleep(random.uniform(0.05, 0.15))
+        await asyncio.gather(
+            *(self._send_one(origin_id, peer, payload) for peer in self.peers if peer != origin_id)
+        )
 
     def air_to_ground(self, aircraft_id: str, data: dict):
         """
@@ -14,6 +14,7 @@ from core.risk import RiskEngine
 from core.consensus import ConsensusEngine
 from core.policy import PolicyManager
 from core.safety import SafetyManager
+from core import clock
 
 from satellite.satellite import SatelliteNode
 from drone.drone import DroneNode
@@ -21,8 +22,25 @@ from ground.sensor import GroundSensor
 from agency.agency import AgencyRegistry
 
 import json
+import logging
+import os
+import queue
 import time
 import random
+from logging.handlers import QueueHandler, QueueListener
+
+
+def configure_logging(level: str = "WARNING") -> QueueListener:
+    """
+    Route all log records through a queue drained by a background listener,
+    so emitting a record never blocks on stdout. Caller stops the listener.
+    """
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, logging.StreamHandler())
+    logging.basicConfig(level=level, handlers=[QueueHandler(log_queue)])
+    listener.start()
+    return listener
+
 
 # Simulated NASA API for global cities/regions
 def get_active_regions():
@@ -83,6 +101,7 @@ def run_cycle(router, risk, consensus, agencies, regions):
     """
 
     print("\n[SIM] Running global observation cycle...\n")
+    clock.tick()
 
     reports = {}
 
@@ -111,10 +130,14 @@ def run_cycle(router, risk, consensus, agencies, regions):
 
 
 if __name__ == "__main__":
+    # Set AUTONOMOUS_SPACE_LOG_LEVEL=DEBUG to trace every packet.
+    log_listener = configure_logging(os.environ.get("AUTONOMOUS_SPACE_LOG_LEVEL", "WARNING"))
     crypto, router, risk, consensus, policy, safety, agencies, regions = initialize_system()
 
     for i in range(2):  # run two cycles for demo
         run_cycle(router, risk, consensus, agencies, regions)
         time.sleep(3)
 
+    consensus.close()
     print("\n[MISSION] Global Autonomous Network stable and secure.")
+    log_listener.stop()
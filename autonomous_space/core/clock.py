@@ -0,0 +1,34 @@
+"""
+clock.py
+NASA Space Apps 2025 – Cycle Clock
+
+Observation timestamps do not need a fresh wall-clock read per call. now()
+returns a cached time.time() value that is refreshed whenever it is older
+than MAX_AGE_NS, so callers outside the simulation cycle still see time
+advance. The simulation also calls tick() at each cycle boundary.
+
+Timestamps that go on the wire for replay checks should read
+time.time_ns() directly.
+"""
+
+import time
+
+# Cached wall time is refreshed at most once per millisecond
+MAX_AGE_NS = 1_000_000
+
+_wall = 0.0      # time.time() at the last tick
+_stamp_ns = None  # time.monotonic_ns() at the last tick
+
+
+def tick():
+    """Capture wall time for the current cycle."""
+    global _wall, _stamp_ns
+    _stamp_ns = time.monotonic_ns()
+    _wall = time.time()
+
+
+def now() -> float:
+    """Wall-clock seconds, at most MAX_AGE_NS stale."""
+    if _stamp_ns is None or time.monotonic_ns() - _stamp_ns > MAX_AGE_NS:
+        tick()
+    return _wall
@@ -19,14 +19,38 @@ References:
  - NIST PQC Final Round (Kyber / Dilithium)
 """
 
-import random
-import statistics
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 
+import numpy as np
+
+from core import clock
+from core.jit import njit, JIT_OPTIONS
 from core.safety import SafetyManager
 
+METRICS = ("heat", "drought", "flood")
+
+
+@njit("float64[:](float64[:], float64[:], float64)", **JIT_OPTIONS)
+def _verify_kernel(values, noise, reliability):
+    """Apply reliability-scaled noise to risk values and clip to [0, 1]."""
+    return np.minimum(np.maximum(values + noise * (1.0 - reliability), 0.0), 1.0)
+
+
+@njit("float64[:](float64[:, :], float64[:])", **JIT_OPTIONS)
+def _weighted_mean_kernel(risks, conf):
+    """Confidence-weighted mean of each risk column."""
+    n, m = risks.shape
+    out = np.zeros(m)
+    total = 0.0
+    for i in range(n):
+        total += conf[i]
+        for j in range(m):
+            out[j] += risks[i, j] * conf[i]
+    return out / total
+
 
 class AgencyNode:
     """
@@ -34,26 +58,28 @@ class AgencyNode:
     Each performs independent verification and sends secure signed telemetry.
     """
 
+    __slots__ = ("name", "reliability", "safety", "_rng")
+
     def __init__(self, name: str, reliability: float = 0.9, safety: SafetyManager = None):
         self.name = name
         self.reliability = reliability
         self.safety = safety or SafetyManager()
+        self._rng = np.random.default_rng()
 
     def verify(self, risk_data: Dict[str, float]) -> Dict[str, float]:
         """
         Simulate agency-level verification with confidence-weighted bias.
         """
-        verified = {}
-        for key, value in risk_data.items():
-            deviation = random.uniform(-0.03, 0.03) * (1.0 - self.reliability)
-            verified[key] = max(0.0, min(1.0, value + deviation))
-        confidence = self.reliability * random.uniform(0.9, 1.0)
+        values = np.fromiter((risk_data[m] for m in METRICS), dtype=np.float64, count=len(METRICS))
+        noise = self._rng.uniform(-0.03, 0.03, len(METRICS))
+        verified = dict(zip(METRICS, _verify_kernel(values, noise, self.reliability).tolist()))
+        confidence = self.reliability * float(self._rng.uniform(0.9, 1.0))
 
         payload = {
             "agency": self.name,
             "verified_risk": verified,
             "confidence": confidence,
-            "timestamp": time.time(),
+            "timestamp": clock.now(),
         }
         return self.safety.secure_wrap(self.name, payload)
 
@@ -72,30 +98,49 @@ class ConsensusEngine:
             AgencyNode("USGS", reliability=0.93, safety=self.safety),
             AgencyNode("LocalAgency", reliability=0.85, safety=self.safety),
         ]
+        # hashlib/hmac release the GIL, so node verification can overlap.
+        # Owned by the engine: release it with close() or a with-block.
+        self._pool = ThreadPoolExecutor(max_workers=len(self.nodes))
+
+    def close(self):
+        """Shut down the verification thread pool."""
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def aggregate(self, risk_report: Dict[str, Dict[str, float]]) -> Dict[str, float]:
         """
         Collects secure reports, verifies them, and computes weighted mean per metric.
         """
+        risk = risk_report["risk"]
+        envelopes = self._pool.map(lambda node: node.verify(risk), self.nodes)
         verified_data = []
-        for node in self.nodes:
-            envelope = node.verify(risk_report["risk"])
+        for envelope in envelopes:
             try:
                 data = self.safety.secure_unwrap(envelope)
                 verified_data.append(data)
             except Exception as e:
                 print(f"Warning: Data rejected from {envelope['node_id']} — {str(e)}")
 
-        combined = {}
-        for metric in ["heat", "drought", "flood"]:
-            weighted_sum = sum(d["verified_risk"][metric] * d["confidence"] for d in verified_data)
-            total_weight = sum(d["confidence"] for d in verified_data)
-            combined[metric] = round(weighted_sum / total_weight, 3)
+        if not verified_data:
+            # Never publish an empty weighted mean (NaN) as consensus risk
+            raise ValueError("Consensus failed: no agency report passed verification")
+
+        risks = np.array(
+            [[d["verified_risk"][m] for m in METRICS] for d in verified_data], dtype=np.float64
+        ).reshape(-1, len(METRICS))
+        conf = np.array([d["confidence"] for d in verified_data], dtype=np.float64)
+        weighted = _weighted_mean_kernel(risks, conf)
+        combined = {metric: round(value, 3) for metric, value in zip(METRICS, weighted.tolist())}
 
         consensus = {
             "agencies_involved": [d["agency"] for d in verified_data],
             "consensus_risk": combined,
-            "mean_confidence": round(statistics.mean(d["confidence"] for d in verified_data), 3),
+            "mean_confidence": round(float(conf.mean()), 3),
             "generated_at": time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()),
         }
         return consensus
@@ -115,6 +160,6 @@ if __name__ == "__main__":
     risk_engine = RiskEngine()
     risk_report = risk_engine.analyze()
 
-    engine = ConsensusEngine()
-    final_report = engine.consensus_report(risk_report)
+    with ConsensusEngine() as engine:
+        final_report = engine.consensus_report(risk_report)
     print(final_report)
@@ -0,0 +1,23 @@
+"""
+jit.py
+NASA Space Apps 2025 – Optional Numba JIT Support
+
+Numeric kernels are decorated with `njit` and explicit signatures so they
+compile at import and are cached on disk. When Numba is not installed the
+decorator is a no-op and the kernels run as plain NumPy/Python.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+# Compile flags shared by the hot kernels
+JIT_OPTIONS = {"cache": True, "nogil": True, "fastmath": True}
@@ -0,0 +1,56 @@
+"""
+mockrng.py
+NASA Space Apps 2025 – Batched Random Source for Mock Sensors
+
+Mock data generators draw many scalar uniforms per cycle. MockRNG serves
+them from per-range pools refilled in one NumPy batch, instead of one
+`random.uniform` call per value.
+
+Each refill seeds a fresh Generator from the stdlib `random` module, so a
+test that calls `random.seed(...)` followed by `MOCK_RNG.reset()` gets a
+reproducible stream.
+"""
+
+import random
+
+import numpy as np
+
+
+class MockRNG:
+    """
+    Pooled uniform draws keyed by (low, high) range, plus pooled unit rows
+    keyed by width.
+    """
+
+    def __init__(self, batch: int = 4096):
+        self.batch = batch
+        self._pools = {}
+
+    def uniform(self, low: float, high: float) -> float:
+        """Next uniform draw in [low, high), refilling the range's pool when empty."""
+        pool = self._pools.get((low, high))
+        if not pool:
+            rng = np.random.default_rng(random.getrandbits(64))
+            pool = rng.uniform(low, high, self.batch).tolist()
+            self._pools[(low, high)] = pool
+        return pool.pop()
+
+    def row(self, n: int) -> list:
+        """
+        Next n independent U[0, 1) draws as one list, for callers that need
+        several values per cycle and scale them inline.
+        """
+        pool = self._pools.get(n)
+        if not pool:
+            rng = np.random.default_rng(random.getrandbits(64))
+            pool = rng.random((self.batch, n)).tolist()
+            self._pools[n] = pool
+        return pool.pop()
+
+    def reset(self):
+        """Drop all buffered draws (e.g. after reseeding `random`)."""
+        self._pools.clear()
+
+
+# Shared instance used by the mock sensor generators
+MOCK_RNG = MockRNG()
@@ -15,9 +15,26 @@ Real-world analogs:
 
 import time
 import random
-from datetime import datetime
 from typing import Dict, Any
 
+import numpy as np
+
+_RNG = np.random.default_rng()
+
+# (epoch second, ISO-8601 string) of the last formatted timestamp
+_utc_iso_cache = [-1, ""]
+
+
+def _utc_iso() -> str:
+    """
+    UTC ISO-8601 timestamp (second resolution), reformatted at most once per second.
+    """
+    now = int(time.time())
+    if now != _utc_iso_cache[0]:
+        _utc_iso_cache[0] = now
+        _utc_iso_cache[1] = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now))
+    return _utc_iso_cache[1]
+
 
 class PolicyManager:
     """
@@ -27,11 +44,8 @@ class PolicyManager:
     def __init__(self):
         self.last_action_timestamp = 0.0
         self.rate_limit_seconds = 3.0  # throttle between major automated actions
-        self.hitl_required = {
-            "drought_alert": True,
-            "flood_warning": True,
-            "routine_update": False,
-        }
+        # Actions that need human sign-off; anything else passes straight through.
+        self._hitl_required = frozenset({"drought_alert", "flood_warning"})
 
     def _rate_limit(self) -> bool:
         """
@@ -47,11 +61,10 @@ class PolicyManager:
         """
         Simulate human review for critical actions.
         """
-        required = self.hitl_required.get(action, False)
-        if not required:
+        if action not in self._hitl_required:
             return True
         # simulate a random approval delay
-        approved = random.choice([True, True, False])  # 2/3 chance of approval
+        approved = bool(_RNG.random() < 2 / 3)  # 2/3 chance of approval
         decision_time = random.uniform(0.5, 2.5)
         time.sleep(decision_time)
         return approved
@@ -61,7 +74,7 @@ class PolicyManager:
         Gate the flow of automated decisions through safety, rate-limit, and HITL checks.
         """
         if not self._rate_limit():
-            return {"status": "rate_limited", "timestamp": datetime.utcnow().isoformat()}
+            return {"status": "rate_limited", "timestamp": _utc_iso()}
 
         approved = self._human_in_loop(action)
         if not approved:
@@ -71,7 +84,7 @@ class PolicyManager:
         record = {
             "status": "approved",
             "action": action,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _utc_iso(),
             "verified_data": data,
         }
         return record
@@ -14,10 +14,68 @@ No real cryptographic material is generated—educational simulation only.
 
 import os
 import hmac
+import json
 import hashlib
-from base64 import b64encode, b64decode
-from Crypto.Cipher import AES
-from Crypto.Random import get_random_bytes
+import logging
+from binascii import b2a_base64, a2b_base64
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
+# Per-packet tracing is DEBUG so the hot path skips formatting and I/O.
+logger = logging.getLogger(__name__)
+
+# Payloads above this size are fed to the MAC in chunks of the same size.
+_STREAM_CHUNK = 65536
+
+
+def _b64e(data: bytes) -> str:
+    """Base64-encode bytes to str via the C binascii codec, no trailing newline."""
+    return b2a_base64(data, newline=False).decode("ascii")
+
+
+def _b64d(encoded: str) -> bytes:
+    """Decode a base64 str produced by _b64e."""
+    return a2b_base64(encoded)
+
+
+def _json_default(obj):
+    """Stdlib json fallback for NumPy arrays and scalars."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _serialize(message) -> bytes:
+    """Plaintext bytes for a str, bytes, or JSON-like payload (dicts may hold NumPy values)."""
+    if isinstance(message, bytes):
+        return message
+    if isinstance(message, str):
+        return message.encode()
+    if orjson is not None:
+        return orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(message, separators=(",", ":"), default=_json_default).encode()
+
+
+def _deserialize(plaintext: bytes):
+    """Inverse of _serialize for JSON payloads."""
+    if orjson is not None:
+        return orjson.loads(plaintext)
+    return json.loads(plaintext)
+
+
+def _hmac_stream(h, message: bytes, chunk: int = _STREAM_CHUNK):
+    """Absorb message into h; large payloads go in memoryview chunks."""
+    if len(message) <= chunk:
+        h.update(message)
+        return h
+    mv = memoryview(message)
+    for start in range(0, len(mv), chunk):
+        h.update(mv[start:start + chunk])
+    return h
 
 class PQCryptoHybrid:
     def __init__(self):
@@ -25,43 +83,69 @@ class PQCryptoHybrid:
         self._public_key = "NASA_SIMULATED_PQC_PUBLIC"
         self._private_key = "NASA_SIMULATED_PQC_PRIVATE"
         self._signature_key = b"NASA_DILITHIUM_SIM_KEY"
+        # Keyed HMAC state is absorbed once and copied per packet.
+        self._hmac_proto = hmac.new(self._signature_key, b"", hashlib.sha512)
+        # Stand-in for the Kyber keypair: capsules wrap the shared key under
+        # an AES-GCM key derived from the private key, so decapsulation
+        # recovers exactly what was encapsulated.
+        self._kem = AESGCM(hashlib.sha256(self._private_key.encode()).digest())
+
+    def _keyed_hmac(self, message: bytes):
+        """Return an HMAC-SHA-512 over message, reusing the pre-keyed state."""
+        return _hmac_stream(self._hmac_proto.copy(), message)
 
     # -------------------------------------------------------------
     # 1. Session Key Handling (Kyber simulation)
     # -------------------------------------------------------------
     def kyber_encapsulate(self):
-        """Simulate Kyber key encapsulation."""
-        shared_key = get_random_bytes(32)
-        capsule = hashlib.sha512(shared_key).hexdigest()[:64]
-        print("[PQC] [Kyber] Key encapsulated (simulated).")
+        """Simulate Kyber key encapsulation. Returns (shared_key, base64 capsule)."""
+        shared_key = os.urandom(32)
+        nonce = os.urandom(12)
+        capsule = _b64e(nonce + self._kem.encrypt(nonce, shared_key, None))
+        logger.debug("[PQC] [Kyber] Key encapsulated (simulated).")
         return shared_key, capsule
 
     def kyber_decapsulate(self, capsule):
-        """Simulate Kyber key recovery."""
-        derived = hashlib.sha256(capsule.encode()).digest()
-        print("[PQC] [Kyber] Key decapsulated (simulated).")
-        return derived[:32]
+        """Simulate Kyber key recovery: unwrap the shared key from a capsule."""
+        raw = _b64d(capsule)
+        shared_key = self._kem.decrypt(raw[:12], raw[12:], None)
+        logger.debug("[PQC] [Kyber] Key decapsulated (simulated).")
+        return shared_key
 
     # -------------------------------------------------------------
     # 2. Data Encryption (AES-256-GCM)
     # -------------------------------------------------------------
+    def new_aes_session(self):
+        """
+        Kyber-encapsulate one key and build its AES-GCM context once.
+        Returns (capsule, aead); pass it to encrypt_message(session=...) so
+        packets only draw a fresh nonce instead of re-running the key schedule.
+        With random 96-bit nonces a key must seal at most 2**32 messages
+        (NIST SP 800-38D); long-lived callers have to rekey well before that.
+        """
+        shared_key, capsule = self.kyber_encapsulate()
+        return capsule, AESGCM(shared_key)
+
+    @staticmethod
+    def _aes_seal(aead: AESGCM, plaintext: bytes) -> bytes:
+        """Seal plaintext under an AES-GCM context. Returns raw nonce || ciphertext || tag."""
+        nonce = os.urandom(12)
+        # AESGCM (OpenSSL, AES-NI + PCLMUL) returns ciphertext || tag
+        sealed = aead.encrypt(nonce, plaintext, None)
+        logger.debug("[PQC] [AES-256-GCM] Encryption complete.")
+        return nonce + sealed
+
     def aes_encrypt(self, plaintext: bytes, key: bytes = None):
-        """Encrypt plaintext using AES-256-GCM."""
-        key = key or self._session_key or get_random_bytes(32)
-        nonce = get_random_bytes(12)
-        cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
-        ciphertext, tag = cipher.encrypt_and_digest(plaintext)
-        print("[PQC] [AES-256-GCM] Encryption complete.")
-        return b64encode(nonce + tag + ciphertext).decode()
-
-    def aes_decrypt(self, encoded: str, key: bytes = None):
-        """Decrypt ciphertext using AES-256-GCM."""
-        raw = b64decode(encoded)
-        nonce, tag, ciphertext = raw[:12], raw[12:28], raw[28:]
+        """Encrypt plaintext using AES-256-GCM. Returns raw nonce || ciphertext || tag."""
+        key = key or self._session_key or os.urandom(32)
+        return self._aes_seal(AESGCM(key), plaintext)
+
+    def aes_decrypt(self, raw: bytes, key: bytes = None):
+        """Decrypt raw nonce || ciphertext || tag using AES-256-GCM."""
+        nonce, sealed = raw[:12], raw[12:]
         key = key or self._session_key
-        cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
-        plaintext = cipher.decrypt_and_verify(ciphertext, tag)
-        print("[PQC] [AES-256-GCM] Decryption verified.")
+        plaintext = AESGCM(key).decrypt(nonce, sealed, None)
+        logger.debug("[PQC] [AES-256-GCM] Decryption verified.")
         return plaintext
 
     # -------------------------------------------------------------
@@ -69,15 +153,15 @@ class PQCryptoHybrid:
     # -------------------------------------------------------------
     def dilithium_sign(self, message: bytes):
         """Simulate Dilithium signing (HMAC-based)."""
-        sig = hmac.new(self._signature_key, message, hashlib.sha512).hexdigest()
-        print("[PQC] [Dilithium] Signature created.")
+        sig = self._keyed_hmac(message).digest()
+        logger.debug("[PQC] [Dilithium] Signature created.")
         return sig
 
-    def dilithium_verify(self, message: bytes, signature: str):
+    def dilithium_verify(self, message: bytes, signature: bytes):
         """Simulate Dilithium signature verification."""
-        expected = hmac.new(self._signature_key, message, hashlib.sha512).hexdigest()
+        expected = self._keyed_hmac(message).digest()
         valid = hmac.compare_digest(expected, signature)
-        print(f"[PQC] [Dilithium] Signature valid={valid}")
+        logger.debug("[PQC] [Dilithium] Signature valid=%s", valid)
         return valid
 
     # -------------------------------------------------------------
@@ -85,64 +169,75 @@ class PQCryptoHybrid:
     # -------------------------------------------------------------
     def hmac_integrity(self, message: bytes, key: bytes = None):
         """Compute message integrity tag."""
-        key = key or self._signature_key
-        return hmac.new(key, message, hashlib.sha512).hexdigest()
+        if not key or key == self._signature_key:
+            return self._keyed_hmac(message).digest()
+        return _hmac_stream(hmac.new(key, None, hashlib.sha512), message).digest()
 
-    def verify_integrity(self, message: bytes, tag: str, key: bytes = None):
+    def verify_integrity(self, message: bytes, tag: bytes, key: bytes = None):
         """Verify message integrity tag."""
         expected = self.hmac_integrity(message, key)
         valid = hmac.compare_digest(expected, tag)
-        print(f"[PQC] [HMAC] Integrity valid={valid}")
+        logger.debug("[PQC] [HMAC] Integrity valid=%s", valid)
         return valid
 
     # -------------------------------------------------------------
     # 5. Unified Hybrid Encryption Pipeline
     # -------------------------------------------------------------
-    def encrypt_message(self, message: str):
+    def encrypt_message(self, message, session=None):
         """
         Encrypt + sign a message using hybrid post-quantum crypto.
+        message may be str, bytes, or a dict/list serialized as JSON.
+        session: optional (capsule, aead) from new_aes_session(); without it
+        a fresh key is encapsulated for this packet.
         Returns a secure packet that includes:
           - capsule (Kyber)
           - ciphertext (AES)
           - signature (Dilithium)
           - integrity tag (HMAC)
         """
-        # Step 1: Kyber key exchange
-        shared_key, capsule = self.kyber_encapsulate()
+        # Step 1: Kyber key exchange (or reuse the caller's session)
+        if session is None:
+            session = self.new_aes_session()
+        capsule, aead = session
 
-        # Step 2: AES encryption
-        ciphertext = self.aes_encrypt(message.encode(), shared_key)
+        # Step 2: AES encryption (raw bytes; base64 only at the envelope)
+        raw = self._aes_seal(aead, _serialize(message))
 
         # Step 3: Dilithium signature
-        signature = self.dilithium_sign(ciphertext.encode())
+        signature = self.dilithium_sign(raw)
 
         # Step 4: Integrity tag
-        tag = self.hmac_integrity(ciphertext.encode())
+        tag = self.hmac_integrity(raw)
 
         packet = {
             "capsule": capsule,
-            "ciphertext": ciphertext,
-            "signature": signature,
-            "tag": tag
+            "ciphertext": _b64e(raw),
+            "signature": _b64e(signature),
+            "tag": _b64e(tag)
         }
 
-        print("[PQC] Secure packet generated.")
+        logger.debug("[PQC] Secure packet generated.")
         return packet
 
     def decrypt_message(self, packet: dict):
         """Decrypt and verify a post-quantum secure packet."""
-        shared_key = self.kyber_decapsulate(packet["capsule"].encode())
+        shared_key = self.kyber_decapsulate(packet["capsule"])
+        raw = _b64d(packet["ciphertext"])
 
         # Step 1: Verify integrity
-        if not self.verify_integrity(packet["ciphertext"].encode(), packet["tag"]):
+        if not self.verify_integrity(raw, _b64d(packet["tag"])):
             raise ValueError("Integrity verification failed.")
 
         # Step 2: Verify signature
-        if not self.dilithium_verify(packet["ciphertext"].encode(), packet["signature"]):
+        if not self.dilithium_verify(raw, _b64d(packet["signature"])):
             raise ValueError("Signature verification failed.")
 
         # Step 3: Decrypt AES data
-        plaintext = self.aes_decrypt(packet["ciphertext"], shared_key)
+        plaintext = self.aes_decrypt(raw, shared_key)
 
-        print("[PQC] Packet decrypted successfully.")
+        logger.debug("[PQC] Packet decrypted successfully.")
         return plaintext.decode()
+
+    def decrypt_payload(self, packet: dict):
+        """Decrypt a packet whose plaintext is a JSON payload and parse it."""
+        return _deserialize(self.decrypt_message(packet))
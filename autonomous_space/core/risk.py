@@ -11,9 +11,31 @@ based on data inputs from NASA & USGS observation layers:
  - GPM (precipitation)
 """
 
-import random
 import json
 
+import numpy as np
+
+from core.jit import NUMBA_AVAILABLE
+from core.mockrng import MOCK_RNG
+from core.risk_kernel import DEFAULT_RANGES, make_risk_kernel, normalization_params, risk_kernel
+
+
+def quantize(risk):
+    """Map risk in [0, 1] to uint8 0–255 (round half up)."""
+    return (np.asarray(risk) * 255.0 + 0.5).astype(np.uint8)
+
+
+def dequantize(q):
+    """Map uint8 0–255 risk back to float in [0, 1]."""
+    return np.asarray(q) / 255.0
+
+
+# Power-law risk curves tabulated over the 256 quantized normalized inputs
+_LEVELS = np.linspace(0.0, 1.0, 256)
+HEAT_LUT = quantize(_LEVELS ** 1.8)
+DROUGHT_LUT = quantize(_LEVELS ** 1.5)
+FLOOD_LUT = quantize(_LEVELS ** 2)
+
 
 class RiskEngine:
     """
@@ -21,31 +43,49 @@ class RiskEngine:
     Each metric is normalized 0–1, then risk levels are computed per category.
     """
 
-    def __init__(self):
+    def __init__(self, profile=None):
         self.thresholds = {
             "heat": 0.75,
             "drought": 0.65,
             "flood": 0.70,
         }
+        self.ranges = dict(DEFAULT_RANGES)
+        self._kernel = risk_kernel
+        if profile:
+            self.compile(profile)
+
+    def compile(self, profile):
+        """
+        Specialize the batch/raster paths for a deployment profile, e.g.
+        {"heat": (20, 50), "drought": (-1, 5), "flood": (0, 120), "thr": {...}}.
+        Missing ranges keep their defaults; "thr" updates alert thresholds.
+        The scalar analyze() path is unaffected.
+        """
+        self.thresholds.update(profile.get("thr", {}))
+        ranges = {k: tuple(map(float, profile.get(k, v))) for k, v in DEFAULT_RANGES.items()}
+        if ranges != self.ranges:
+            self.ranges = ranges
+            self._kernel = make_risk_kernel(**ranges)
+        return self
 
     # ------------------------------------------------------------------
     # MOCK DATA INPUTS (replaceable with NASA APIs)
     # ------------------------------------------------------------------
     def _get_mock_temperature(self):
         """Simulate ECOSTRESS LST (°C)."""
-        return random.uniform(25, 50)
+        return MOCK_RNG.uniform(25, 50)
 
     def _get_mock_precip(self):
         """Simulate GPM rainfall (mm/day)."""
-        return random.uniform(0, 100)
+        return MOCK_RNG.uniform(0, 100)
 
     def _get_mock_evapotranspiration(self):
         """Simulate ET from OpenET / Landsat (mm/day)."""
-        return random.uniform(0.5, 6.0)
+        return MOCK_RNG.uniform(0.5, 6.0)
 
     def _get_mock_groundwater(self):
         """Simulate GRACE-FO groundwater anomaly (cm)."""
-        return random.uniform(-10, 10)
+        return MOCK_RNG.uniform(-10, 10)
 
     # ------------------------------------------------------------------
     # METRIC CALCULATIONS
@@ -102,16 +142,115 @@ class RiskEngine:
 
         return summary
 
+    # ------------------------------------------------------------------
+    # BATCH ANALYSIS (SoA arrays, one element per cell/tile)
+    # ------------------------------------------------------------------
+    def _risk_u8(self, temps, precips, ets, gws):
+        """
+        Vectorized uint8 heat/drought/flood risk, same curves as compute_*_risk.
+        Normalized inputs are quantized to 8 bits and mapped through the curve LUTs.
+        NumPy fallback for risk_kernel: one float64 scratch buffer is reused in
+        place for all three normalizations, evaluating the kernel's expressions
+        in the same order with the same constants so both paths quantize alike.
+        """
+        (t_lo, t_scale), (d_lo, d_scale), (f_lo, f_scale) = normalization_params(
+            *(self.ranges[k] for k in ("heat", "drought", "flood")))
+        buf = np.subtract(temps, t_lo, dtype=np.float64)
+        buf *= t_scale
+        heat = HEAT_LUT[quantize(np.clip(buf, 0, 1, out=buf))]
+
+        tmp = np.multiply(precips, 0.02, dtype=np.float64)
+        np.subtract(ets, tmp, out=buf)
+        np.multiply(gws, 0.05, out=tmp)
+        buf -= tmp
+        buf -= d_lo
+        buf *= d_scale
+        drought = DROUGHT_LUT[quantize(np.clip(buf, 0, 1, out=buf))]
+
+        np.maximum(gws, 0.0, out=tmp)
+        np.add(precips, tmp, out=buf)
+        buf -= f_lo
+        buf *= f_scale
+        flood = FLOOD_LUT[quantize(np.clip(buf, 0, 1, out=buf))]
+        return heat, drought, flood
+
+    def analyze_batch(self, temps, precips, ets, gws):
+        """
+        Risk analysis over 1-D arrays of temperature, precipitation, ET and
+        groundwater. Returns per-element uint8 risk arrays and alert masks.
+        """
+        return self.analyze_tile(temps, precips, ets, gws)
+
+    def _tile_risk(self, temps, precips, ets, gws):
+        """
+        uint8 heat/drought/flood arrays for one tile. With Numba the three
+        risks come from one fused pass that reads each band once and writes
+        each output once, with no intermediate arrays.
+        """
+        bands = [np.ascontiguousarray(a, dtype=np.float32) for a in (temps, precips, ets, gws)]
+        shape = bands[0].shape
+        if not NUMBA_AVAILABLE:
+            return self._risk_u8(*bands)
+        flat = [b.ravel() for b in bands]
+        out = [np.empty(flat[0].size, dtype=np.uint8) for _ in range(3)]
+        self._kernel(*flat, HEAT_LUT, DROUGHT_LUT, FLOOD_LUT, *out)
+        return tuple(o.reshape(shape) for o in out)
+
+    def analyze_tile(self, temps, precips, ets, gws):
+        """
+        Risk analysis over a raster tile (any shape, e.g. 256x256).
+        Uses the Numba per-pixel kernel when available, else the NumPy path.
+        """
+        heat, drought, flood = self._tile_risk(temps, precips, ets, gws)
+        return {
+            "risk": {"heat": heat, "drought": drought, "flood": flood},
+            "alerts": self._alert_masks(heat, drought, flood, quantized=True),
+        }
+
+    def analyze_raster(self, temps, precips, ets, gws, tile=256):
+        """
+        Risk analysis over full 2-D rasters, processed tile by tile.
+        All four bands of a tile are consumed together so intermediates stay
+        cache-resident; 256 matches the Sentinel-2 chunk size.
+        """
+        height, width = np.shape(temps)
+        heat = np.empty((height, width), dtype=np.uint8)
+        drought = np.empty((height, width), dtype=np.uint8)
+        flood = np.empty((height, width), dtype=np.uint8)
+        for i in range(0, height, tile):
+            for j in range(0, width, tile):
+                window = (slice(i, i + tile), slice(j, j + tile))
+                tile_heat, tile_drought, tile_flood = self._tile_risk(
+                    temps[window], precips[window], ets[window], gws[window]
+                )
+                heat[window] = tile_heat
+                drought[window] = tile_drought
+                flood[window] = tile_flood
+        return {
+            "risk": {"heat": heat, "drought": drought, "flood": flood},
+            "alerts": self._alert_masks(heat, drought, flood, quantized=True),
+        }
+
     # ------------------------------------------------------------------
     # ALERTS & REPORTS
     # ------------------------------------------------------------------
+    def _alert_masks(self, heat, drought, flood, quantized=False):
+        """
+        Boolean alert masks; works elementwise on arrays or on scalars.
+        quantized=True compares uint8 risks against thresholds quantized the
+        same way, so an alert is never lost to rounding.
+        """
+        th = self.thresholds
+        if quantized:
+            th = {k: int(quantize(v)) for k, v in th.items()}
+        return {
+            "Heatwave Risk": np.greater_equal(heat, th["heat"]),
+            "Drought Conditions": np.greater_equal(drought, th["drought"]),
+            "Flood Potential": np.greater_equal(flood, th["flood"]),
+        }
+
     def _generate_alerts(self, heat, drought, flood):
-        alerts = []
-        if heat >= self.thresholds["heat"]:
-            alerts.append("Heatwave Risk")
-        if drought >= self.thresholds["drought"]:
-            alerts.append("Drought Conditions")
-        if flood >= self.thresholds["flood"]:
-            alerts.append("Flood Potential")
+        masks = self._alert_masks(heat, drought, flood)
+        alerts = [label for label, hit in masks.items() if hit]
         return alerts or ["Normal Conditions"]
 
@@ -0,0 +1,73 @@
+"""
+risk_kernel.py
+NASA Space Apps 2025 – Per-Pixel Risk Kernel
+
+Numba kernel for raster-scale heat, drought, and flood risk. It evaluates
+the same curves as RiskEngine.compute_*_risk, one pixel per iteration,
+parallelized over the flattened tile. Normalized inputs are quantized to
+8 bits and the power-law curves are read from 256-entry uint8 LUTs
+(core.risk.HEAT_LUT etc.), so no pow() runs per pixel.
+
+All three risks are fused into one loop body: T, P, ET and GW are read once
+per pixel and every intermediate stays in registers, so a tile costs one
+streaming pass over four inputs and three outputs. make_risk_kernel()
+specializes the kernel for a deployment's normalization ranges.
+"""
+
+import numpy as np
+
+from core.jit import njit, prange, NUMBA_AVAILABLE
+
+
+# Normalization ranges (min, max) of the default deployment profile
+DEFAULT_RANGES = {"heat": (20.0, 50.0), "drought": (-1.0, 5.0), "flood": (0.0, 120.0)}
+
+
+def normalization_params(heat=DEFAULT_RANGES["heat"], drought=DEFAULT_RANGES["drought"],
+                         flood=DEFAULT_RANGES["flood"]):
+    """
+    (lo, 1/span) offset and reciprocal scale per metric, shared by the
+    kernel and the NumPy fallback so both normalize with the same float64
+    constants.
+    """
+    return tuple((float(lo), 1.0 / (hi - lo)) for lo, hi in (heat, drought, flood))
+
+
+def make_risk_kernel(heat=DEFAULT_RANGES["heat"], drought=DEFAULT_RANGES["drought"],
+                     flood=DEFAULT_RANGES["flood"]):
+    """
+    Build a risk kernel specialized for one deployment's normalization ranges.
+    The offsets and reciprocal spans are closure constants, which Numba
+    freezes into the compiled code, so LLVM folds them into the loop body.
+    No fastmath: reassociation would let the quantized output drift from
+    RiskEngine._risk_u8, which evaluates the same float64 expressions.
+    """
+    (t_lo, t_scale), (d_lo, d_scale), (f_lo, f_scale) = normalization_params(heat, drought, flood)
+
+    @njit(parallel=True)
+    def kernel(T, P, ET, GW, heat_lut, drought_lut, flood_lut, out_heat, out_drought, out_flood):
+        """
+        Fill uint8 out_heat/out_drought/out_flood from flat 1-D input bands.
+        """
+        for i in prange(T.size):
+            t_norm = min(1.0, max(0.0, (T[i] - t_lo) * t_scale))
+            out_heat[i] = heat_lut[int(t_norm * 255.0 + 0.5)]
+
+            dryness = ET[i] - P[i] * 0.02 - GW[i] * 0.05
+            d_norm = min(1.0, max(0.0, (dryness - d_lo) * d_scale))
+            out_drought[i] = drought_lut[int(d_norm * 255.0 + 0.5)]
+
+            f_norm = min(1.0, max(0.0, (P[i] + max(0.0, GW[i]) - f_lo) * f_scale))
+            out_flood[i] = flood_lut[int(f_norm * 255.0 + 0.5)]
+
+    if NUMBA_AVAILABLE:
+        # Warm-up so the first real tile does not pay the compile cost
+        dummy = np.zeros(4, dtype=np.float32)
+        out = np.empty(4, dtype=np.uint8)
+        lut = np.zeros(256, dtype=np.uint8)
+        kernel(dummy, dummy, dummy, dummy, lut, lut, lut, out, out.copy(), out.copy())
+    return kernel
+
+
+# Kernel for the default profile, compiled at import
+risk_kernel = make_risk_kernel()
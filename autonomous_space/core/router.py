@@ -10,10 +10,17 @@ from pqcrypto.py for end-to-end confidentiality and integrity.
 Author: [Your Name]
 """
 
+import asyncio
+import logging
 import random
-import time
 from core.pqcrypto import PQCryptoHybrid
 
+logger = logging.getLogger(__name__)
+
+# Packets sealed per AES-GCM session before rekeying; far below the
+# 2**32 limit for random 96-bit nonces.
+REKEY_AFTER = 2 ** 20
+
 
 class SecureRouter:
     """
@@ -29,6 +36,10 @@ class SecureRouter:
         self.crypto = crypto_engine
         self.nodes = {}
         self.latency = (0.05, 0.25)  # seconds, simulating comms delay
+        # AES-GCM session reused across packets (only the nonce rotates)
+        # until REKEY_AFTER packets have been sealed under it
+        self._aes = self.crypto.new_aes_session()
+        self._aes_packets = 0
 
     # -------------------------------------------------------------
     # Node Registry
@@ -38,7 +49,7 @@ class SecureRouter:
         if node.node_id in self.nodes:
             raise ValueError(f"Duplicate node ID: {node.node_id}")
         self.nodes[node.node_id] = node
-        print(f"[ROUTER] Node registered: {node.node_id}")
+        logger.info("[ROUTER] Node registered: %s", node.node_id)
 
     def list_nodes(self):
         """Return list of registered nodes."""
@@ -52,41 +63,83 @@ class SecureRouter:
         Simulate encrypted transmission to a node.
         Encrypt → send → receive → decrypt.
         """
+        return asyncio.run(self._send_async(node_id, message))
+
+    async def _send_async(self, node_id: str, message: str):
+        """
+        Coroutine behind send(); usable directly from running event loops.
+        """
         if node_id not in self.nodes:
             raise ValueError(f"Target node not found: {node_id}")
 
-        node = self.nodes[node_id]
-        print(f"[ROUTER] Preparing secure transmission to {node_id} ...")
+        logger.debug("[ROUTER] Preparing secure transmission to %s ...", node_id)
 
         # Step 1: Encrypt message packet
-        packet = self.crypto.encrypt_message(message)
-
-        # Step 2: Simulate latency
-        time.sleep(random.uniform(*self.latency))
+        packet = self.crypto.encrypt_message(message, session=self._session())
 
-        # Step 3: Deliver to node (simulate decryption)
-        response = node.receive_secure_packet(packet, self.crypto)
+        # Steps 2-3: Simulate latency, deliver to node
+        return await self._deliver(node_id, packet)
 
-        return response
+    def _session(self):
+        """
+        Return the current AES-GCM session for one more packet, encapsulating
+        a fresh key once REKEY_AFTER packets have used the current one.
+        """
+        if self._aes_packets >= REKEY_AFTER:
+            self._aes = self.crypto.new_aes_session()
+            self._aes_packets = 0
+            logger.debug("[ROUTER] AES-GCM session rekeyed")
+        self._aes_packets += 1
+        return self._aes
+
+    async def _deliver(self, node_id: str, packet: dict):
+        """
+        Simulate link latency, then hand an encrypted packet to the node for decryption.
+        """
+        await asyncio.sleep(random.uniform(*self.latency))
+        return self.nodes[node_id].receive_secure_packet(packet, self.crypto)
 
-    def broadcast(self, message: str, node_filter=None):
+    async def broadcast(self, message: str, node_filter=None):
         """
         Broadcast an encrypted message to all or filtered nodes.
         node_filter: list of IDs or function(node) -> bool
+        The message is encrypted once and the same packet is delivered to every
+        target; link delays run concurrently. Call via asyncio.run(...).
+        """
+        targets = [
+            node_id for node_id, node in self.nodes.items()
+            if not node_filter or node_id in node_filter or node_filter(node)
+        ]
+        if not targets:
+            return {}
+
+        logger.debug("[ROUTER] Preparing secure broadcast to %d nodes ...", len(targets))
+        return await self.secure_send_prebuilt(message, targets)
+
+    async def secure_send_prebuilt(self, base, recipients):
+        """
+        Encrypt a recipient-independent payload once and deliver the same
+        sealed packet to each recipient; link delays run concurrently.
+        Each delivery carries its own plaintext "to" header outside the
+        ciphertext. Recipients must be registered with this router; unknown
+        IDs are skipped. Returns {recipient: result} for delivered nodes.
         """
-        results = {}
-        for node_id, node in self.nodes.items():
-            if node_filter and not (node_id in node_filter or node_filter(node)):
-                continue
-            results[node_id] = self.send(node_id, message)
-        return results
+        targets = [node_id for node_id in recipients if node_id in self.nodes]
+        skipped = len(recipients) - len(targets)
+        if skipped:
+            logger.debug("[ROUTER] Skipping %d unregistered recipient(s)", skipped)
+        if not targets:
+            return {}
+        packet = self.crypto.encrypt_message(base, session=self._session())
+        results = await asyncio.gather(
+            *(self._deliver(node_id, dict(packet, to=node_id)) for node_id in targets)
+        )
+        return dict(zip(targets, results))
 
     # -------------------------------------------------------------
     # Diagnostics
     # -------------------------------------------------------------
     def audit_traffic(self):
-        """Print a snapshot of network nodes and simulated latency."""
-        print("\n[ROUTER] === Network Audit ===")
-        for node_id, node in self.nodes.items():
-            print(f" - {node_id} ({node.__class__.__name__})")
-        print("==============================\n")
+        """Log a snapshot of network nodes and simulated latency."""
+        lines = [f" - {node_id} ({node.__class__.__name__})" for node_id, node in self.nodes.items()]
+        logger.info("[ROUTER] === Network Audit ===\n%s", "\n".join(lines))
@@ -15,8 +15,17 @@ Based on principles from:
 import time
 import hmac
 import hashlib
+import json
 import secrets
-from typing import Dict, Any
+import struct
+import binascii
+from typing import Dict, Any, List, Sequence, Union
+
+try:  # OpenSSL EVP HMAC (SHA-NI where the CPU has it)
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives import hmac as openssl_hmac
+except ImportError:
+    openssl_hmac = None
 
 
 class SafetyManager:
@@ -26,47 +35,91 @@ class SafetyManager:
 
     def __init__(self, trusted_nodes=None, hmac_key=None):
         # Trusted entities: NASA, NOAA, FAA, USGS, USBR, CityGov
-        self.trusted_nodes = trusted_nodes or [
+        self.trusted_nodes = frozenset(trusted_nodes or [
             "NASA",
             "NOAA",
             "USGS",
             "FAA",
             "USBR",
             "CityGov",
-        ]
+        ])
         self.hmac_key = hmac_key or secrets.token_bytes(32)
+        # Pre-keyed HMAC-SHA256 state; copied per message to skip the key pads.
+        if openssl_hmac is not None:
+            self._hmac_template = openssl_hmac.HMAC(self.hmac_key, hashes.SHA256())
+        else:
+            self._hmac_template = hmac.new(self.hmac_key, b"", hashlib.sha256)
         self.replay_window = 10.0  # seconds
-        self.last_timestamps: Dict[str, float] = {}
+        self.last_timestamps: Dict[str, int] = {}  # wall-clock ns (time.time_ns)
+        self._last_wrap_ns = 0
 
     # ----------------------------- Integrity Layer -----------------------------
 
-    def compute_hmac(self, message: str) -> str:
+    def compute_hmac_bytes(self, message: bytes) -> bytes:
+        """
+        Raw 32-byte HMAC-SHA256 digest of already-serialized message bytes.
+        """
+        mac = self._hmac_template.copy()
+        mac.update(message)
+        if openssl_hmac is not None:
+            return mac.finalize()
+        return mac.digest()
+
+    def compute_hmac(self, message: Union[str, bytes]) -> str:
         """
-        Compute an HMAC-SHA256 signature to ensure message integrity.
+        Compute an HMAC-SHA256 signature (hex) to ensure message integrity.
         """
-        mac = hmac.new(self.hmac_key, message.encode(), hashlib.sha256)
-        return mac.hexdigest()
+        if isinstance(message, str):
+            message = message.encode()
+        return self.compute_hmac_bytes(message).hex()
 
-    def verify_hmac(self, message: str, signature: str) -> bool:
+    def verify_hmac(self, message: Union[str, bytes], signature: str) -> bool:
         """
         Verify message integrity using constant-time comparison.
         """
         expected = self.compute_hmac(message)
         return hmac.compare_digest(expected, signature)
 
+    def verify_hmac_bytes(self, message: bytes, digest: bytes) -> bool:
+        """
+        Raw-digest fast path: verify against compute_hmac_bytes() output
+        without the hex round-trip.
+        """
+        return hmac.compare_digest(self.compute_hmac_bytes(message), digest)
+
+    def verify_hmac_batch(self, messages: Sequence[bytes], signatures: Sequence[bytes]) -> List[bool]:
+        """
+        Verify many (message, raw digest) pairs against the pre-keyed HMAC
+        state. Envelope-sized messages hash in about a microsecond, so a plain
+        loop beats dispatching them to worker threads.
+        """
+        verify = self.verify_hmac_bytes
+        return [verify(message, digest) for message, digest in zip(messages, signatures)]
+
     # ----------------------------- Replay Protection -----------------------------
 
-    def is_replay(self, node_id: str, timestamp: float) -> bool:
+    def is_replay(self, node_id: str, timestamp: int) -> bool:
         """
         Check for replayed or out-of-order messages.
+        timestamp is the envelope's wall-clock ns (time.time_ns), comparable
+        across processes and hosts.
         """
-        last_time = self.last_timestamps.get(node_id, 0)
-        if timestamp <= last_time:
+        if self._is_outside_window(node_id, timestamp):
             return True
-        if abs(time.time() - timestamp) > self.replay_window:
+        self._commit_timestamp(node_id, timestamp)
+        return False
+
+    def _is_outside_window(self, node_id: str, timestamp: int) -> bool:
+        """Pure replay/staleness check; does not record the timestamp."""
+        if timestamp <= self.last_timestamps.get(node_id, 0):
             return True
+        # Fresh clock read, not the cycle clock: a stale tick would widen the window.
+        # Symmetric, so future-dated envelopes cannot pin last_timestamps ahead.
+        return abs(time.time_ns() - timestamp) > self.replay_window * 1e9
+
+    def _commit_timestamp(self, node_id: str, timestamp: int):
+        """Record the latest accepted timestamp for node_id."""
         self.last_timestamps[node_id] = timestamp
-        return False
 
     # ----------------------------- Trust Validation -----------------------------
 
@@ -78,41 +131,57 @@ class SafetyManager:
 
     # ----------------------------- Secure Envelope -----------------------------
 
+    @staticmethod
+    def _envelope_bytes(node_id: str, timestamp: int, payload: Dict[str, Any]) -> bytes:
+        """
+        Canonical HMAC input: node_id | packed int64 wall-clock ns | sorted-key JSON payload.
+        """
+        body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return node_id.encode() + b"|" + struct.pack("<q", timestamp) + b"|" + body.encode()
+
     def secure_wrap(self, node_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create a signed message envelope with replay protection.
         """
-        timestamp = time.time()
-        data_str = f"{node_id}|{timestamp}|{payload}"
-        signature = self.compute_hmac(data_str)
+        # Wall-clock ns on the wire (monotonic clocks differ per host); bumped
+        # past the previous envelope so replay ordering stays strictly increasing
+        timestamp = max(time.time_ns(), self._last_wrap_ns + 1)
+        self._last_wrap_ns = timestamp
+        digest = self.compute_hmac_bytes(self._envelope_bytes(node_id, timestamp, payload))
         return {
             "node_id": node_id,
             "timestamp": timestamp,
             "payload": payload,
-            "signature": signature,
+            # base64 at the boundary keeps envelopes JSON-serializable
+            "signature": binascii.b2a_base64(digest, newline=False).decode("ascii"),
         }
 
     def secure_unwrap(self, envelope: Dict[str, Any]) -> Dict[str, Any]:
         """
         Verify sender trust, integrity, and replay protection.
         Returns verified payload if valid, or raises an exception.
+        Checks run cheapest first; the replay timestamp is only recorded once
+        the HMAC passes, so forged envelopes cannot advance last_timestamps.
         """
         node_id = envelope["node_id"]
         timestamp = envelope["timestamp"]
         payload = envelope["payload"]
         signature = envelope["signature"]
 
-        data_str = f"{node_id}|{timestamp}|{payload}"
-
         if not self.validate_sender(node_id):
             raise PermissionError(f"Untrusted sender: {node_id}")
 
-        if not self.verify_hmac(data_str, signature):
-            raise ValueError("Integrity check failed (HMAC mismatch)")
-
-        if self.is_replay(node_id, timestamp):
+        if self._is_outside_window(node_id, timestamp):
             raise TimeoutError("Replay or delayed message detected")
 
+        try:
+            digest = binascii.a2b_base64(signature)
+        except (binascii.Error, TypeError):
+            raise ValueError("Integrity check failed (malformed signature)")
+        if not self.verify_hmac_bytes(self._envelope_bytes(node_id, timestamp, payload), digest):
+            raise ValueError("Integrity check failed (HMAC mismatch)")
+
+        self._commit_timestamp(node_id, timestamp)
         return payload
 
 
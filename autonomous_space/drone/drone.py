@@ -10,7 +10,11 @@ References:
 
 import time
 import random
+from core import clock
 from core.router import SecureRouter
+from core.mockrng import MOCK_RNG
+
+ANOMALY_TYPES = ("heat_spike", "flood_patch", "ground_crack")
 
 
 class DroneNode:
@@ -30,21 +34,23 @@ class DroneNode:
         Simulates drone-based perception using YOLOv8-like detections (mock).
         Returns environmental data and visual anomaly detections.
         """
+        # One pooled row per scan: water, dry land, anomaly gate, type, confidence
+        r = MOCK_RNG.row(5)
         detections = [
-            {"label": "water_body", "confidence": round(random.uniform(0.8, 0.99), 2)},
-            {"label": "dry_land", "confidence": round(random.uniform(0.7, 0.95), 2)},
+            {"label": "water_body", "confidence": round(0.8 + 0.19 * r[0], 2)},
+            {"label": "dry_land", "confidence": round(0.7 + 0.25 * r[1], 2)},
         ]
 
         # Simulate detection of hazards or anomalies
         anomaly = None
-        if random.random() < 0.2:
+        if r[2] < 0.2:
             anomaly = {
-                "type": random.choice(["heat_spike", "flood_patch", "ground_crack"]),
-                "confidence": round(random.uniform(0.7, 0.98), 2),
+                "type": ANOMALY_TYPES[int(r[3] * len(ANOMALY_TYPES))],
+                "confidence": round(0.7 + 0.28 * r[4], 2),
             }
 
         frame_data = {
-            "timestamp": time.time(),
+            "timestamp": clock.now(),
             "drone_id": self.drone_id,
             "detections": detections,
             "anomaly": anomaly,
@@ -81,5 +87,6 @@ if __name__ == "__main__":
     router = SecureRouter(PQCryptoHybrid())
     drone = DroneNode("DRONE-ALPHA", router, region="Nevada")
     for _ in range(3):
+        clock.tick()
         drone.perform_cycle()
         time.sleep(1)
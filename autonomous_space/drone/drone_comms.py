@@ -23,15 +23,16 @@ class DroneMeshComms:
         if node_id not in self.mesh_nodes:
             self.mesh_nodes.append(node_id)
 
-    def broadcast(self, origin_id: str, data: dict):
+    async def broadcast(self, origin_id: str, data: dict):
         """
         Broadcast data to all registered drones via secure channel.
+        The payload is built and encrypted once for every peer; per-peer link
+        delays run concurrently in the router. Call via asyncio.run(...).
         """
-        for node in self.mesh_nodes:
-            if node != origin_id:
-                packet = {"from": origin_id, "to": node, "data": data}
-                self.router.secure_send(packet)
-                time.sleep(random.uniform(0.05, 0.2))
+        recipients = [node for node in self.mesh_nodes if node != origin_id]
+        if not recipients:
+            return {}
+        return await self.router.secure_send_prebuilt({"from": origin_id, "data": data}, recipients)
 
     def relay_to_satellite(self, drone_id: str, data: dict):
         """
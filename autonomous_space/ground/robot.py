@@ -12,9 +12,12 @@ forming the 'bottom-up' half of the autonomous-space system.
 All communications are routed securely through the core router.
 """
 
-import random
-import time
+import logging
+from core import clock
 from core.router import SecureRouter
+from core.mockrng import MOCK_RNG
+
+logger = logging.getLogger(__name__)
 
 
 class GroundSensor:
@@ -28,10 +31,10 @@ class GroundSensor:
         """
         data = {
             "location": self.location,
-            "temperature_c": round(random.uniform(28, 40), 2),
-            "soil_moisture_pct": round(random.uniform(10, 45), 2),
-            "humidity_pct": round(random.uniform(40, 80), 2),
-            "timestamp": time.time(),
+            "temperature_c": round(MOCK_RNG.uniform(28, 40), 2),
+            "soil_moisture_pct": round(MOCK_RNG.uniform(10, 45), 2),
+            "humidity_pct": round(MOCK_RNG.uniform(40, 80), 2),
+            "timestamp": clock.now(),
         }
         return data
 
@@ -41,7 +44,7 @@ class GroundSensor:
         """
         reading = self.read_environment()
         encrypted = self.router.encrypt_message(reading)
-        print(f"[Sensor @ {self.location}] transmitting encrypted packet.")
+        logger.info("[Sensor @ %s] transmitting encrypted packet.", self.location)
         return encrypted
 
 
@@ -11,10 +11,13 @@ support satellite and drone networks with ground truth.
 """
 
 import random
-import time
+import logging
+from core import clock
 from core.router import SecureRouter
 from ground.sensor import GroundSensor
 
+logger = logging.getLogger(__name__)
+
 
 class GroundRobot:
     def __init__(self, name: str, location: str, router: SecureRouter):
@@ -41,7 +44,7 @@ class GroundRobot:
             "robot_id": self.name,
             "location": self.location,
             "risk_flag": risk,
-            "timestamp": time.time(),
+            "timestamp": clock.now(),
         }
         return report
 
@@ -51,7 +54,7 @@ class GroundRobot:
         """
         report = self.assess_environment()
         encrypted = self.router.encrypt_message(report)
-        print(f"[Robot {self.name}] transmitting encrypted status.")
+        logger.info("[Robot %s] transmitting encrypted status.", self.name)
         return encrypted
 
 
@@ -13,7 +13,19 @@ References:
 
 import time
 import random
+import numpy as np
+from core import clock
 from core.router import SecureRouter
+from core.mockrng import MOCK_RNG
+
+# One observation row; the owning node supplies satellite_id.
+OBS_DTYPE = np.dtype([
+    ("ts", "<f8"),
+    ("temp", "<f4"),    # Kelvin
+    ("hum", "<f4"),     # %
+    ("gw", "<f4"),      # GRACE-FO anomaly
+    ("surf", "<f4"),    # surface temperature, Kelvin
+])
 
 
 class SatelliteNode:
@@ -22,31 +34,57 @@ class SatelliteNode:
     and relaying them via encrypted crosslinks or downlinks.
     """
 
+    RING_SIZE = 1024
+
     def __init__(self, sat_id: str, router: SecureRouter, orbit_type="LEO"):
         self.sat_id = sat_id
         self.router = router
         self.orbit_type = orbit_type
         self.health = "Nominal"
         self.power_level = 100.0
+        # Observation history as a structured ring buffer, written in place
+        self._ring = np.empty(self.RING_SIZE, dtype=OBS_DTYPE)
+        self._cursor = 0
 
-    def collect_observation(self) -> dict:
+    def collect_observation(self) -> np.ndarray:
         """
         Simulates retrieval of Earth surface and atmospheric data.
+        Writes one OBS_DTYPE row into the ring and returns a 1-element view
+        of it (valid until the ring wraps).
+        """
+        i = self._cursor % self.RING_SIZE
+        self._cursor += 1
+        r = MOCK_RNG.row(4)
+        self._ring[i] = (
+            clock.now(),
+            290 + 30 * r[0],
+            10 + 60 * r[1],
+            -2.0 + 4.0 * r[2],
+            280 + 50 * r[3],
+        )
+        return self._ring[i:i + 1]
+
+    def observation_dict(self, obs: np.ndarray) -> dict:
+        """
+        JSON-friendly view of a single observation row, built only for transmit.
         """
-        data = {
-            "temperature": round(random.uniform(290, 320), 2),   # Kelvin
-            "humidity": round(random.uniform(10, 70), 1),        # %
-            "groundwater": round(random.uniform(-2.0, 2.0), 3),  # GRACE-FO anomaly
-            "surface_temp": round(random.uniform(280, 330), 1),
-            "timestamp": time.time(),
+        row = obs[0]
+        return {
+            "temperature": round(float(row["temp"]), 2),
+            "humidity": round(float(row["hum"]), 1),
+            "groundwater": round(float(row["gw"]), 3),
+            "surface_temp": round(float(row["surf"]), 1),
+            "timestamp": float(row["ts"]),
             "satellite_id": self.sat_id,
         }
-        return data
 
-    def broadcast(self, payload: dict, target: str = "GroundStation"):
+    def broadcast(self, payload, target: str = "GroundStation"):
         """
         Encrypts and transmits data using SecureRouter.
+        payload: dict, or an observation row from collect_observation.
         """
+        if isinstance(payload, np.ndarray):
+            payload = self.observation_dict(payload)
         message = {"from": self.sat_id, "to": target, "payload": payload}
         self.router.secure_send(message)
 
@@ -70,5 +108,6 @@ if __name__ == "__main__":
     router = SecureRouter(PQCryptoHybrid())
     sat = SatelliteNode("SAT-LEO-01", router)
     for _ in range(2):
+        clock.tick()
         sat.execute_cycle()
         time.sleep(0.5)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Modules import each other as top-level packages (core.*, agency.*), as
+# when run from the autonomous_space directory.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
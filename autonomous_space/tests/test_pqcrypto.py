@@ -0,0 +1,32 @@
+import pytest
+
+from core.pqcrypto import PQCryptoHybrid
+
+
+def test_kyber_decapsulate_recovers_shared_key():
+    crypto = PQCryptoHybrid()
+    shared_key, capsule = crypto.kyber_encapsulate()
+    assert crypto.kyber_decapsulate(capsule) == shared_key
+
+
+def test_message_round_trip():
+    crypto = PQCryptoHybrid()
+    packet = crypto.encrypt_message("heat_alert")
+    assert crypto.decrypt_message(packet) == "heat_alert"
+
+
+def test_payload_round_trip_with_session():
+    crypto = PQCryptoHybrid()
+    session = crypto.new_aes_session()
+    payload = {"temperature_c": 38.7, "risk_flag": "heat_alert"}
+    for _ in range(3):
+        packet = crypto.encrypt_message(payload, session=session)
+        assert crypto.decrypt_payload(packet) == payload
+
+
+def test_tampered_ciphertext_is_rejected():
+    crypto = PQCryptoHybrid()
+    packet = crypto.encrypt_message("heat_alert")
+    packet["ciphertext"] = crypto.encrypt_message("flood_alert")["ciphertext"]
+    with pytest.raises(ValueError):
+        crypto.decrypt_message(packet)
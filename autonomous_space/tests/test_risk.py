@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from core.jit import NUMBA_AVAILABLE
+from core.risk import RiskEngine
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+def test_numba_and_numpy_paths_agree():
+    rng = np.random.default_rng(2025)
+    shape = (300, 300)
+    temps = rng.uniform(10.0, 60.0, shape).astype(np.float32)
+    precips = rng.uniform(0.0, 150.0, shape).astype(np.float32)
+    ets = rng.uniform(-2.0, 8.0, shape).astype(np.float32)
+    gws = rng.uniform(-20.0, 20.0, shape).astype(np.float32)
+
+    engine = RiskEngine()
+    fast = engine._tile_risk(temps, precips, ets, gws)
+    slow = engine._risk_u8(temps, precips, ets, gws)
+    for a, b in zip(fast, slow):
+        assert a.shape == b.shape
+        assert np.abs(a.astype(np.int16) - b.astype(np.int16)).max() <= 1
@@ -15,12 +15,25 @@ Features:
 
 import cv2
 import numpy as np
-import time, json, requests, os, threading
+import time, json, requests, os, threading, queue, base64
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from scipy.ndimage import gaussian_filter1d
+from scipy.interpolate import PchipInterpolator
 from scipy.signal import find_peaks
 from pathlib import Path
 from gpsd import gps
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 # --------------------------------------------------------------------
 # CONFIGURATION
@@ -36,41 +49,118 @@ POST_INTERVAL = 15
 SAVE_DIR = Path("captures")
 SAVE_DIR.mkdir(exist_ok=True)
 
+# One keep-alive connection to the dashboard, reused for every POST
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+def _dumps(obj):
+    # ndarrays are encoded directly; no .tolist() round-trip
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=lambda a: a.tolist()).encode()
+
+def encode_intensity(spectrum):
+    # [0, 1] spectrum → little-endian uint16, base64 (decode: frombuffer("<u2") / 65535)
+    q = np.rint(np.clip(spectrum, 0, 1) * 65535).astype("<u2")
+    return base64.b64encode(q.tobytes()).decode("ascii")
+
+def post_payload(payload):
+    return _SESSION.post(SERVER_URL, data=_dumps(payload),
+                         headers={"Content-Type": "application/json"}, timeout=2)
+
 # --------------------------------------------------------------------
 # GPS HANDLER
 # --------------------------------------------------------------------
+_GPS = None
+_LAST_FIX = {"lat": None, "lon": None}
+
 def get_gps_fix():
+    # One gpsd connection, opened lazily; the last fix is kept if a read fails
+    global _GPS, _LAST_FIX
     try:
-        g = gps()
-        g.connect()
-        data = g.get_current()
-        return {"lat": data["lat"], "lon": data["lon"]}
+        if _GPS is None:
+            _GPS = gps()
+            _GPS.connect()
+        data = _GPS.get_current()
+        _LAST_FIX = {"lat": data["lat"], "lon": data["lon"]}
     except Exception:
-        return {"lat": None, "lon": None}
+        _GPS = None
+    return _LAST_FIX
 
 # --------------------------------------------------------------------
 # CALIBRATION UTILITIES
 # --------------------------------------------------------------------
 def save_calibration(pixels, wavelengths):
     coeffs = np.polyfit(pixels, wavelengths, POLY_ORDER)
-    json.dump({"coeffs": coeffs.tolist()}, open(CAL_FILE, "w"))
+    CAL_FILE.write_bytes(_dumps({"coeffs": coeffs}))
     print("Calibration saved:", coeffs)
 
 def load_calibration():
     if CAL_FILE.exists():
-        d = json.load(open(CAL_FILE))
+        with open(CAL_FILE) as f:
+            d = json.load(f)
         return np.array(d["coeffs"])
     # Fallback rough calibration
     return np.polyfit([100, 300], [430, 550], POLY_ORDER)
 
-coeffs = load_calibration()
-def pix_to_nm(p): return np.polyval(coeffs, p)
+_PIXELS = np.arange(WIDTH, dtype=np.float32)
+coeffs = None
+_CUBIC = None  # float32 (C0, C1, C2, C3) when POLY_ORDER is 3
+WAVELENGTHS = None
+
+def pix_to_nm(p):
+    if _CUBIC is None:
+        return np.polyval(coeffs, p)
+    # Horner form with the coefficients fixed as float32 scalars
+    C0, C1, C2, C3 = _CUBIC
+    p = np.asarray(p, np.float32)
+    return ((C0 * p + C1) * p + C2) * p + C3
+
+def _build_wavelengths():
+    global WAVELENGTHS
+    WAVELENGTHS = pix_to_nm(_PIXELS)
+
+def reload_calibration():
+    # Calibration only changes via reload, so the pixel → nm grid is cached here
+    global coeffs, _CUBIC
+    coeffs = load_calibration()
+    _CUBIC = tuple(coeffs.astype(np.float32)) if len(coeffs) == 4 else None
+    _build_wavelengths()
+
+reload_calibration()
 
 # --------------------------------------------------------------------
 # DARK/WHITE FRAME NORMALIZATION
 # --------------------------------------------------------------------
 dark_frame = None
 white_frame = None
+GAIN = None  # per-pixel 255 / (white - dark), built on first full-frame use
+DARK_BAND = GAIN_BAND = None  # same, for the grayscale ROI_Y band only
+
+def prepare_reference_gain():
+    # Only the ROI rows are touched, so memory-mapped references fault in ~40 rows
+    global GAIN, DARK_BAND, GAIN_BAND
+    GAIN = None
+    DARK_BAND = cv2.cvtColor(dark_frame[ROI_Y[0]:ROI_Y[1]], cv2.COLOR_BGR2GRAY)
+    white_band = cv2.cvtColor(white_frame[ROI_Y[0]:ROI_Y[1]], cv2.COLOR_BGR2GRAY)
+    GAIN_BAND = (255.0 / np.clip(white_band.astype(np.int16) - DARK_BAND, 1, None)).astype(np.float32)
+    if fused_band_sum is not None:
+        # compile before the first frame
+        fused_band_sum(DARK_BAND, DARK_BAND, GAIN_BAND, np.empty(DARK_BAND.shape[1], np.float32))
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def fused_band_sum(band, dark_band, gain_band, out):
+        # Dark/white correction clipped to [0, 255] and column sum in one pass
+        H, W = band.shape
+        out[:] = 0.0
+        for i in range(H):
+            for j in range(W):
+                v = (np.float32(band[i, j]) - np.float32(dark_band[i, j])) * gain_band[i, j]
+                out[j] += min(max(v, 0.0), 255.0)
+else:
+    fused_band_sum = None
 
 def capture_reference_frames(cap):
     global dark_frame, white_frame
@@ -82,110 +172,246 @@ def capture_reference_frames(cap):
     _, white_frame = cap.read()
     np.save("dark.npy", dark_frame)
     np.save("white.npy", white_frame)
+    prepare_reference_gain()
     print("Reference frames saved.")
 
 def load_reference_frames():
     global dark_frame, white_frame
     if os.path.exists("dark.npy") and os.path.exists("white.npy"):
-        dark_frame = np.load("dark.npy")
-        white_frame = np.load("white.npy")
+        dark_frame = np.load("dark.npy", mmap_mode="r")
+        white_frame = np.load("white.npy", mmap_mode="r")
+        prepare_reference_gain()
 
 load_reference_frames()
 
 def normalize_frame(frame):
-    if dark_frame is None or white_frame is None:
+    global GAIN
+    if DARK_BAND is None:
         return frame
-    corrected = (frame.astype(np.float32) - dark_frame.astype(np.float32))
-    white_corr = (white_frame.astype(np.float32) - dark_frame.astype(np.float32))
-    white_corr[white_corr <= 0] = 1
-    norm = np.clip(corrected / white_corr, 0, 1)
-    return (norm * 255).astype(np.uint8)
+    if GAIN is None:
+        white_corr = white_frame.astype(np.int16) - dark_frame.astype(np.int16)
+        GAIN = (255.0 / np.clip(white_corr, 1, None)).astype(np.float32)
+    # Saturating uint8 subtract/multiply: clips to [0, 255] without float frames
+    return cv2.multiply(cv2.subtract(frame, dark_frame), GAIN, dtype=cv2.CV_8U)
 
 # --------------------------------------------------------------------
 # SPECTRAL RESPONSE CORRECTION
 # --------------------------------------------------------------------
 def load_response_curve():
     if RESPONSE_FILE.exists():
-        d = json.load(open(RESPONSE_FILE))
+        with open(RESPONSE_FILE) as f:
+            d = json.load(f)
         return np.array(d["wavelength_nm"]), np.array(d["response"])
     return None, None
 
 def save_response_curve(wavelengths, response):
-    json.dump({"wavelength_nm": wavelengths.tolist(), "response": response.tolist()}, open(RESPONSE_FILE, "w"))
+    RESPONSE_FILE.write_bytes(_dumps({"wavelength_nm": np.asarray(wavelengths), "response": np.asarray(response)}))
     print("Spectral response curve saved.")
 
-response_wl, response_val = load_response_curve()
+response_wl = response_val = None
+INV_RESPONSE = None
+
+def _build_inv_response():
+    # Per-pixel inverse response, interpolated onto the current WAVELENGTHS
+    global INV_RESPONSE
+    INV_RESPONSE = np.ones_like(WAVELENGTHS, dtype=np.float32)
+    if response_wl is not None:
+        # Monotone PCHIP avoids the kinks (false peaks) of linear interpolation;
+        # clamp to the curve's range like np.interp does at the edges
+        wl = np.clip(WAVELENGTHS, response_wl[0], response_wl[-1])
+        interp = PchipInterpolator(response_wl, response_val)(wl)
+        interp[interp <= 0] = 1
+        INV_RESPONSE = (1.0 / interp).astype(np.float32)
+
+def reload_response():
+    global response_wl, response_val
+    response_wl, response_val = load_response_curve()
+    _build_inv_response()
+
+reload_response()
+
+def _ensure_width(width):
+    # Camera may ignore the requested WIDTH: rebuild the per-pixel LUTs to match
+    global _PIXELS
+    if len(_PIXELS) != width:
+        _PIXELS = np.arange(width, dtype=np.float32)
+        _build_wavelengths()
+        _build_inv_response()
 
-def apply_response_correction(wavelengths, intensity):
-    if response_wl is None:
-        return intensity
-    interp = np.interp(wavelengths, response_wl, response_val)
-    interp[interp <= 0] = 1
-    corrected = intensity / interp
-    return corrected
+def reload_all():
+    reload_calibration()
+    reload_response()
+    load_reference_frames()
+
+def apply_response_correction(intensity):
+    _ensure_width(len(intensity))
+    intensity *= INV_RESPONSE
+    return intensity
 
 # --------------------------------------------------------------------
 # FRAME → SPECTRUM PIPELINE
 # --------------------------------------------------------------------
+# Smoothing kernel, sigma 2 truncated at 4 sigma (17 taps) like gaussian_filter1d
+BLUR_KERNEL = cv2.getGaussianKernel(17, 2.0, cv2.CV_32F).reshape(1, -1)
+
+# Per-frame (1, width) work buffers, reused across frames
+_SUM_BUF = np.empty((1, WIDTH), np.int32)
+_RAW_BUF = np.empty((1, WIDTH), np.float32)
+_SPECTRUM_BUF = np.empty((1, WIDTH), np.float32)
+
+def _spectrum_buffers(width):
+    global _SUM_BUF, _RAW_BUF, _SPECTRUM_BUF
+    if _SPECTRUM_BUF.shape[1] != width:  # camera ignored the requested WIDTH
+        _SUM_BUF = np.empty((1, width), np.int32)
+        _RAW_BUF = np.empty((1, width), np.float32)
+        _SPECTRUM_BUF = np.empty((1, width), np.float32)
+    return _SUM_BUF, _RAW_BUF, _SPECTRUM_BUF
+
 def extract_spectrum(frame, roi):
-    frame = normalize_frame(frame)
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    band = gray[roi[0]:roi[1], :]
-    intensity = np.mean(band, axis=0)
-    intensity = gaussian_filter1d(intensity, 2)
-    return intensity
+    # Returns a view of a shared buffer, overwritten by the next call.
+    # Column sums (no /N): every consumer normalizes by the spectrum max
+    if GAIN_BAND is not None and list(roi) == ROI_Y:
+        # Crop and convert first; dark/white correction then touches only the band
+        band = cv2.cvtColor(frame[roi[0]:roi[1]], cv2.COLOR_BGR2GRAY)
+        sums, raw, spectrum = _spectrum_buffers(band.shape[1])
+        if fused_band_sum is not None:
+            fused_band_sum(band, DARK_BAND, GAIN_BAND, raw[0])
+        else:
+            band = cv2.multiply(cv2.subtract(band, DARK_BAND), GAIN_BAND, dtype=cv2.CV_8U)
+            cv2.reduce(band, 0, cv2.REDUCE_SUM, dst=sums, dtype=cv2.CV_32S)
+            np.copyto(raw, sums)
+    else:
+        band = cv2.cvtColor(normalize_frame(frame)[roi[0]:roi[1]], cv2.COLOR_BGR2GRAY)
+        sums, raw, spectrum = _spectrum_buffers(band.shape[1])
+        cv2.reduce(band, 0, cv2.REDUCE_SUM, dst=sums, dtype=cv2.CV_32S)
+        np.copyto(raw, sums)
+    # BORDER_REFLECT matches scipy's gaussian_filter1d(intensity, 2) edges
+    cv2.filter2D(raw, -1, BLUR_KERNEL, dst=spectrum, borderType=cv2.BORDER_REFLECT)
+    return spectrum[0]
 
 # --------------------------------------------------------------------
 # MAIN CAPTURE LOOP
 # --------------------------------------------------------------------
+frame_slot = deque(maxlen=1)   # always the latest camera frame
+io_queue = queue.Queue(maxsize=4)  # (payload, frame, spectrum) waiting for POST + save
+
+def _grabber(cap):
+    # Keep draining the camera so its buffer never serves stale frames
+    while True:
+        ret, frame = cap.read()
+        if ret:
+            frame_slot.append(frame)
+
+_SNAPSHOT_POOL = ThreadPoolExecutor(max_workers=1)
+_snapshots = deque()  # in-flight snapshot futures, oldest first
+MAX_SNAPSHOTS_IN_FLIGHT = 2
+
+def _save_snapshot(ts, frame, spectrum, cal):
+    # Save a JPEG preview plus the spectrum itself for validation
+    fname = SAVE_DIR / f"{ts}.jpg"
+    cv2.imwrite(str(fname), frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    np.savez_compressed(SAVE_DIR / f"{ts}.npz", spectrum=spectrum, coeffs=cal)
+    print("Frame saved:", fname)
+
+def _submit_snapshot(frame, spectrum):
+    # Frames are fresh arrays from cap.read(), so no copy is needed here
+    while _snapshots and _snapshots[0].done():
+        _snapshots.popleft()
+    while len(_snapshots) >= MAX_SNAPSHOTS_IN_FLIGHT:
+        _snapshots.popleft().cancel()  # drop the oldest if the SD card falls behind
+    ts = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+    _snapshots.append(_SNAPSHOT_POOL.submit(_save_snapshot, ts, frame, spectrum, coeffs))
+
+def _io_worker():
+    while True:
+        payload, frame, spectrum = io_queue.get()
+        # Snapshot write runs alongside the POST instead of after it
+        _submit_snapshot(frame, spectrum)
+        try:
+            post_payload(payload)
+        except Exception as e:
+            print("Post failed:", e)
+        io_queue.task_done()
+
 def capture_loop():
     cap = cv2.VideoCapture(CAP_INDEX)
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, WIDTH)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, HEIGHT)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # driver keeps only the latest frame
 
     # Optional reference capture
     if dark_frame is None or white_frame is None:
         capture_reference_frames(cap)
 
+    threading.Thread(target=_grabber, args=(cap,), daemon=True).start()
+    threading.Thread(target=_io_worker, daemon=True).start()
+
+    _find_peaks = find_peaks
     while True:
-        ret, frame = cap.read()
-        if not ret:
+        if not frame_slot:
+            time.sleep(0.01)
             continue
+        frame = frame_slot.pop()
 
         spectrum = extract_spectrum(frame, ROI_Y)
-        pixels = np.arange(len(spectrum))
-        wavelengths = pix_to_nm(pixels)
-        spectrum = apply_response_correction(wavelengths, spectrum)
+        spectrum = apply_response_correction(spectrum)
         spectrum /= np.max(spectrum)
 
-        peaks, props = find_peaks(spectrum, height=np.max(spectrum) * 0.05, distance=5)
+        # Spectrum is max-normalized, so 5% of max is simply 0.05
+        peaks, props = _find_peaks(spectrum, height=0.05, distance=5)
         gpsfix = get_gps_fix()
 
         payload = {
             "timestamp": time.time(),
             "gps": gpsfix,
-            "wavelength_nm": wavelengths.tolist(),
-            "intensity": spectrum.tolist(),
-            "peaks_nm": pix_to_nm(peaks).tolist(),
+            # wavelength_nm = np.polyval(coeffs, np.arange(n_pixels)) on the client
+            "n_pixels": int(len(spectrum)),
+            "intensity_u16_b64": encode_intensity(spectrum),
+            "peaks_nm": pix_to_nm(peaks),
             "roi_y": ROI_Y,
-            "coeffs": coeffs.tolist()
+            "coeffs": coeffs
         }
-
-        try:
-            requests.post(SERVER_URL, json=payload, timeout=2)
-        except Exception as e:
-            print("Post failed:", e)
-
-        # Save snapshot for validation
-        fname = SAVE_DIR / f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.png"
-        cv2.imwrite(str(fname), frame)
-        print("Frame saved:", fname)
+        # The worker outlives this frame's buffer, so it gets its own copy
+        io_queue.put((payload, frame, spectrum.copy()))
 
         time.sleep(POST_INTERVAL)
 
 # --------------------------------------------------------------------
 # REFERENCE CALIBRATION ROUTINE
 # --------------------------------------------------------------------
+def _ordered_assignment(cost):
+    # cost is (R, C) with R >= C: pick one row per column, rows strictly
+    # increasing with the column, minimizing the summed cost (small DP)
+    R, C = cost.shape
+    dp = np.full((R + 1, C + 1), np.inf)
+    dp[:, 0] = 0.0
+    for i in range(1, R + 1):
+        for j in range(1, min(i, C) + 1):
+            dp[i, j] = min(dp[i - 1, j], dp[i - 1, j - 1] + cost[i - 1, j - 1])
+    rows, i = [], R
+    for j in range(C, 0, -1):
+        while dp[i, j] == dp[i - 1, j]:
+            i -= 1
+        rows.append(i - 1)
+        i -= 1
+    return np.array(rows[::-1], dtype=int)
+
+def match_reference_lines(peaks, lines):
+    """
+    One-to-one, order-preserving pairing of detected peaks with known lines:
+    dispersion is monotone, so sorted peaks map to sorted lines. Among such
+    pairings the one closest to the current calibration is chosen.
+    Returns (pixels, wavelengths) with min(len(peaks), len(lines)) pairs.
+    """
+    peaks = np.sort(np.asarray(peaks))
+    lines = np.sort(np.asarray(lines, dtype=float))
+    if len(peaks) == 0 or len(lines) == 0:
+        return peaks[:0], lines[:0]
+    cost = np.abs(pix_to_nm(peaks)[:, None] - lines[None, :])
+    if len(peaks) >= len(lines):
+        return peaks[_ordered_assignment(cost)], lines
+    return peaks, lines[_ordered_assignment(cost.T)]
+
 def calibrate_with_reference(cap):
     print("Use reference lamp (mercury/neon/CFL). Capturing frame...")
     _, frame = cap.read()
@@ -197,13 +423,13 @@ def calibrate_with_reference(cap):
     print("Detected peaks at pixels:", peaks)
 
     # Known reference wavelengths for mercury lamp (nm)
-    known_lines = [404.7, 435.8, 546.1, 577.0]
-    user_map = []
-    for i, wl in enumerate(known_lines):
-        if i < len(peaks):
-            user_map.append((peaks[i], wl))
-    pix, wls = zip(*user_map)
+    known_lines = np.array([404.7, 435.8, 546.1, 577.0])
+    pix, wls = match_reference_lines(peaks, known_lines)
+    if len(pix) < POLY_ORDER + 1:
+        print(f"Only {len(pix)} peak/line pairs; need {POLY_ORDER + 1}. Calibration unchanged.")
+        return
     save_calibration(pix, wls)
+    reload_all()
 
 # --------------------------------------------------------------------
 # MAIN
@@ -212,6 +438,7 @@ if __name__ == "__main__":
     cap = cv2.VideoCapture(CAP_INDEX)
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, WIDTH)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, HEIGHT)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # driver keeps only the latest frame
 
     ans = input("Calibrate with reference lamp? [y/N]: ").strip().lower()
     if ans == "y":